@@ -1,45 +1,110 @@
-from flask import Flask, render_template, jsonify, request, send_file
+from flask import Flask, Response, render_template, jsonify, make_response, request, send_file, stream_with_context
+from flask.json.provider import JSONProvider
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_cors import CORS
+from flask_caching import Cache
+from flask_compress import Compress
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
 import pandas as pd
-import geopandas as gpd
-from shapely.geometry import Point
-import json
+import numpy as np
+import orjson
+import csv
+import glob
+import hashlib
 import os
+import sqlite3
+import tempfile
 from datetime import datetime
-import folium
+from functools import wraps
 from dotenv import load_dotenv
+from werkzeug.http import is_resource_modified
 
 # Load environment variables
 load_dotenv()
 
+class ORJSONProvider(JSONProvider):
+    """JSON provider using orjson, which encodes dates and NumPy types natively"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///mexican_trout.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+# Connection pool sizing for server databases; SQLite keeps Flask-SQLAlchemy's defaults
+if not app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+    if os.getenv('DB_POOL') == 'null':
+        # An external pooler such as PgBouncer owns the connections
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'poolclass': NullPool}
+    else:
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+            'pool_size': int(os.getenv('DB_POOL_SIZE', 20)),
+            'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 20)),
+            'pool_pre_ping': True,
+            'pool_recycle': 3600
+        }
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key')
+app.config['CACHE_TYPE'] = os.getenv('CACHE_TYPE', 'SimpleCache')
+app.config['CACHE_REDIS_URL'] = os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIN_SIZE'] = 1024
+# Flask-Compress would buffer streamed responses whole; leave those to the reverse proxy
+app.config['COMPRESS_STREAMS'] = False
+
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Let SQLite readers run alongside an import instead of blocking on it"""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute('PRAGMA temp_store=MEMORY')
+        cursor.execute('PRAGMA mmap_size=268435456')
+        cursor.execute('PRAGMA cache_size=-64000')
+        cursor.close()
 
 # Initialize extensions
 db = SQLAlchemy(app)
 migrate = Migrate(app, db)
 CORS(app)
+cache = Cache(app)
+Compress(app)
+
+# Cache key for /api/statistics, cleared whenever occurrence data is imported
+STATS_CACHE_KEY = 'stats'
+
+# Cache key for the occurrence data version behind ETags, cleared alongside STATS_CACHE_KEY
+DATA_VERSION_CACHE_KEY = 'occurrence_data_version'
 
 # Database Models
 class OccurrenceRecord(db.Model):
     """Model for Mexican trout occurrence records"""
     __tablename__ = 'occurrence_records'
+    __table_args__ = (
+        db.Index('ix_occ_coords', 'latitude', 'longitude'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    unique_record_id = db.Column(db.String(50), unique=True, nullable=False)
+    unique_record_id = db.Column(db.String(50), unique=True, nullable=False, index=True)
     collection_date = db.Column(db.Date)
-    latitude = db.Column(db.Float)
-    longitude = db.Column(db.Float)
+    latitude = db.Column(db.Float, index=True)
+    longitude = db.Column(db.Float, index=True)
     locality_description = db.Column(db.Text)
-    state = db.Column(db.String(100))
+    state = db.Column(db.String(100), index=True)
     municipality = db.Column(db.String(100))
-    river_basin = db.Column(db.String(100))
+    river_basin = db.Column(db.String(100), index=True)
     sub_basin = db.Column(db.String(100))
-    species = db.Column(db.String(100))
+    species = db.Column(db.String(100), index=True)
+    species_id = db.Column(db.Integer, db.ForeignKey('species.id'), index=True)
     genus = db.Column(db.String(100))
     collectors = db.Column(db.String(200))
     field_number = db.Column(db.String(50))
@@ -64,6 +129,8 @@ class Species(db.Model):
     iucn_assessment = db.Column(db.String(200))
     description = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    occurrences = db.relationship('OccurrenceRecord', backref='species_obj', lazy='dynamic')
 
 class GeneticData(db.Model):
     """Model for genetic data from Abadia et al. (2015)"""
@@ -95,6 +162,238 @@ class HydrographicData(db.Model):
     data_quality = db.Column(db.String(50))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+# Mex_trout_core spreadsheet columns mapped to OccurrenceRecord attributes
+OCCURRENCE_COLUMN_MAP = {
+    'Final_database_unique_record_ID': 'unique_record_id',
+    'lat_dec': 'latitude',
+    'long_dec': 'longitude',
+    'locality': 'locality_description',
+    'state': 'state',
+    'municipio': 'municipality',
+    'basin': 'river_basin',
+    'subbasin': 'sub_basin',
+    'species': 'species',
+    'genus': 'genus',
+    'collectors': 'collectors',
+    'field_num': 'field_number',
+    'institution': 'institution',
+    'catalog_num': 'catalog_number',
+    'N_specimens': 'specimen_count',
+    'habitat_notes': 'habitat_notes',
+    'conservation_status': 'conservation_status'
+}
+
+# Rust-based reader, much faster than openpyxl on large workbooks (python-calamine)
+EXCEL_ENGINE = 'calamine'
+
+# Number of rows sent per bulk INSERT
+IMPORT_CHUNK_SIZE = 1000
+
+def parse_collection_dates(values):
+    """Parse a spreadsheet date column into datetime.date values
+
+    Numeric yyyymmdd values (Excel stores them as numbers) are split into
+    year/month/day with integer arithmetic; the remaining text is tried as
+    yyyymmdd and then in any format pandas recognises.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.dt.date
+    
+    numeric = pd.to_numeric(values, errors='coerce')
+    dates = pd.to_datetime(pd.DataFrame({
+        'year': numeric // 10000,
+        'month': numeric // 100 % 100,
+        'day': numeric % 100
+    }), errors='coerce')
+    
+    text = values.where(numeric.isna())
+    dates = dates.combine_first(pd.to_datetime(text, format='%Y%m%d', errors='coerce'))
+    dates = dates.combine_first(pd.to_datetime(text, format='mixed', errors='coerce'))
+    return dates.dt.date
+
+def build_occurrence_rows(df, data_source='Excel Import'):
+    """Convert a Mex_trout_core DataFrame into OccurrenceRecord insert mappings
+
+    Rows without an ID or duplicated within the sheet are dropped; records
+    already in the database are skipped at insert time.
+    """
+    df = df.dropna(subset=['Final_database_unique_record_ID'])
+
+    records = df.reindex(columns=list(OCCURRENCE_COLUMN_MAP)).rename(columns=OCCURRENCE_COLUMN_MAP)
+    records['unique_record_id'] = records['unique_record_id'].astype(str)
+
+    records['collection_date'] = parse_collection_dates(df['data__yyyy'])
+
+    records['latitude'] = pd.to_numeric(records['latitude'], errors='coerce')
+    records['longitude'] = pd.to_numeric(records['longitude'], errors='coerce')
+    specimen_count = pd.to_numeric(records['specimen_count'], errors='coerce')
+    records['specimen_count'] = np.trunc(specimen_count).astype('Int64')
+
+    str_cols = [c for c in records.columns
+                if c not in ('unique_record_id', 'latitude', 'longitude', 'specimen_count', 'collection_date')]
+    records[str_cols] = records[str_cols].fillna('').astype(str)
+    
+    # Resolve the taxon once per import rather than joining on the name per row
+    name_to_id = dict(db.session.query(Species.scientific_name, Species.id).all())
+    records['species_id'] = records['species'].map(name_to_id).astype('Int64')
+    records['data_source'] = data_source
+
+    records = records.drop_duplicates(subset='unique_record_id')
+
+    records = records.astype(object).where(records.notna(), None)
+    return records.to_dict('records')
+
+# Rows fetched per round-trip when streaming large result sets
+STREAM_BATCH_SIZE = 1000
+
+# Largest page of occurrence records one API request may ask for
+MAX_PER_PAGE = 1000
+
+# Columns read by the JSON APIs, selected directly instead of loading full models
+OCCURRENCE_API_COLUMNS = [
+    OccurrenceRecord.id,
+    OccurrenceRecord.unique_record_id,
+    OccurrenceRecord.collection_date,
+    OccurrenceRecord.latitude,
+    OccurrenceRecord.longitude,
+    OccurrenceRecord.locality_description,
+    OccurrenceRecord.state,
+    OccurrenceRecord.municipality,
+    OccurrenceRecord.river_basin,
+    OccurrenceRecord.species,
+    OccurrenceRecord.collectors,
+    OccurrenceRecord.field_number,
+    OccurrenceRecord.institution,
+    OccurrenceRecord.catalog_number,
+    OccurrenceRecord.specimen_count,
+    OccurrenceRecord.conservation_status
+]
+
+MAP_DATA_COLUMNS = [
+    OccurrenceRecord.id,
+    OccurrenceRecord.unique_record_id,
+    OccurrenceRecord.latitude,
+    OccurrenceRecord.longitude,
+    OccurrenceRecord.species,
+    OccurrenceRecord.collection_date,
+    OccurrenceRecord.locality_description,
+    OccurrenceRecord.state,
+    OccurrenceRecord.river_basin,
+    OccurrenceRecord.collectors,
+    OccurrenceRecord.field_number,
+    OccurrenceRecord.institution,
+    OccurrenceRecord.catalog_number
+]
+
+# Map-data columns exposed as GeoJSON feature properties, keyed to their property names
+MAP_PROPERTY_NAMES = {
+    'id': 'id',
+    'unique_record_id': 'unique_record_id',
+    'species': 'species',
+    'collection_date': 'collection_date',
+    'locality_description': 'locality',
+    'state': 'state',
+    'river_basin': 'basin',
+    'collectors': 'collectors',
+    'field_number': 'field_number',
+    'institution': 'institution',
+    'catalog_number': 'catalog_number'
+}
+
+# Generated CSV exports are kept here, named after the data version they contain
+EXPORT_CACHE_DIR = os.getenv('EXPORT_CACHE_DIR', tempfile.gettempdir())
+
+# CSV export header mapped to OccurrenceRecord attributes
+EXPORT_COLUMNS = {
+    'Unique Record ID': 'unique_record_id',
+    'Collection Date': 'collection_date',
+    'Latitude': 'latitude',
+    'Longitude': 'longitude',
+    'Locality Description': 'locality_description',
+    'State': 'state',
+    'Municipality': 'municipality',
+    'River Basin': 'river_basin',
+    'Sub Basin': 'sub_basin',
+    'Species': 'species',
+    'Genus': 'genus',
+    'Collectors': 'collectors',
+    'Field Number': 'field_number',
+    'Institution': 'institution',
+    'Catalog Number': 'catalog_number',
+    'Specimen Count': 'specimen_count',
+    'Habitat Notes': 'habitat_notes',
+    'Conservation Status': 'conservation_status'
+}
+
+# INSERT constructs supporting ON CONFLICT DO NOTHING, by dialect
+DIALECT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert
+}
+
+def insert_ignoring_duplicates(model, rows, key):
+    """Insert mappings in chunks, letting PostgreSQL/SQLite skip rows whose key already exists
+
+    Returns the number of rows actually inserted.
+    """
+    # One parameterless statement compiled once and run executemany-style per chunk;
+    # rowcount is unreliable for executemany, so count the table before and after
+    statement = DIALECT_INSERTS[db.engine.dialect.name](model).on_conflict_do_nothing(index_elements=[key])
+    count_before = db.session.query(db.func.count()).select_from(model).scalar()
+    for start in range(0, len(rows), IMPORT_CHUNK_SIZE):
+        db.session.execute(statement, rows[start:start + IMPORT_CHUNK_SIZE])
+    return db.session.query(db.func.count()).select_from(model).scalar() - count_before
+
+def link_occurrences_to_species():
+    """Set species_id on unlinked occurrence records whose species name matches a Species row
+
+    Returns the number of records linked.
+    """
+    species_id = db.select(Species.id).where(
+        Species.scientific_name == OccurrenceRecord.species
+    ).scalar_subquery()
+    result = db.session.execute(
+        db.update(OccurrenceRecord)
+        .where(
+            OccurrenceRecord.species_id.is_(None),
+            OccurrenceRecord.species.in_(db.select(Species.scientific_name))
+        )
+        .values(species_id=species_id)
+    )
+    return result.rowcount
+
+def occurrence_data_version():
+    """Return (latest updated_at, row count) for the occurrence table, cached between imports"""
+    version = cache.get(DATA_VERSION_CACHE_KEY)
+    if version is None:
+        version = tuple(db.session.query(
+            db.func.max(OccurrenceRecord.updated_at),
+            db.func.count(OccurrenceRecord.id)
+        ).one())
+        cache.set(DATA_VERSION_CACHE_KEY, version, timeout=300)
+    return version
+
+def conditional_on_data(view):
+    """Add ETag/Last-Modified headers tied to the occurrence data and answer 304 when unchanged"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        last_modified, record_count = occurrence_data_version()
+        version = f'{last_modified}|{record_count}|{request.full_path}'
+        etag = hashlib.sha1(version.encode()).hexdigest()
+        
+        # Flask-Compress appends ':<algorithm>' to the ETag of compressed responses
+        etags = [etag] + [f'{etag}:{algorithm}' for algorithm in app.config['COMPRESS_ALGORITHM']]
+        if any(not is_resource_modified(request.environ, etag=tag, last_modified=last_modified) for tag in etags):
+            response = Response(status=304)
+        else:
+            response = make_response(view(*args, **kwargs))
+        
+        response.set_etag(etag)
+        if last_modified:
+            response.last_modified = last_modified
+        return response
+    return wrapper
+
 # Routes
 @app.route('/')
 def index():
@@ -111,7 +410,11 @@ def species_list():
 def species_detail(species_id):
     """Individual species detail page"""
     species = Species.query.get_or_404(species_id)
-    occurrences = OccurrenceRecord.query.filter_by(species=species.scientific_name).all()
+    # Records imported before their Species row existed are matched by name until relinked
+    occurrences = OccurrenceRecord.query.filter(db.or_(
+        OccurrenceRecord.species_id == species.id,
+        db.and_(OccurrenceRecord.species_id.is_(None), OccurrenceRecord.species == species.scientific_name)
+    )).all()
     return render_template('species_detail.html', species=species, occurrences=occurrences)
 
 @app.route('/map')
@@ -125,15 +428,21 @@ def data_explorer():
     return render_template('data.html')
 
 @app.route('/api/occurrences')
+@conditional_on_data
 def api_occurrences():
-    """API endpoint for occurrence data"""
+    """API endpoint for occurrence data
+
+    Pass ``after_id`` (the ``next_cursor`` of the previous response) for
+    keyset pagination; ``page`` is still accepted for offset pagination.
+    """
     page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 50, type=int)
+    per_page = min(max(request.args.get('per_page', 50, type=int), 1), MAX_PER_PAGE)
+    after_id = request.args.get('after_id', type=int)
     species = request.args.get('species')
     basin = request.args.get('basin')
     state = request.args.get('state')
     
-    query = OccurrenceRecord.query
+    query = OccurrenceRecord.query.with_entities(*OCCURRENCE_API_COLUMNS)
     
     if species:
         query = query.filter(OccurrenceRecord.species.contains(species))
@@ -142,14 +451,31 @@ def api_occurrences():
     if state:
         query = query.filter(OccurrenceRecord.state.contains(state))
     
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
-    records = pagination.items
+    query = query.order_by(OccurrenceRecord.id)
+    
+    if after_id is not None:
+        # Seek past the last id seen instead of scanning OFFSET rows
+        records = query.filter(OccurrenceRecord.id > after_id).limit(per_page).all()
+        pagination_info = {
+            'after_id': after_id,
+            'per_page': per_page
+        }
+    else:
+        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        records = pagination.items
+        pagination_info = {
+            'page': page,
+            'per_page': per_page,
+            'total': pagination.total,
+            'pages': pagination.pages
+        }
+    pagination_info['next_cursor'] = records[-1].id if len(records) == per_page else None
     
     return jsonify({
         'records': [{
             'id': record.id,
             'unique_record_id': record.unique_record_id,
-            'collection_date': record.collection_date.isoformat() if record.collection_date else None,
+            'collection_date': record.collection_date,
             'latitude': record.latitude,
             'longitude': record.longitude,
             'locality_description': record.locality_description,
@@ -164,12 +490,7 @@ def api_occurrences():
             'specimen_count': record.specimen_count,
             'conservation_status': record.conservation_status
         } for record in records],
-        'pagination': {
-            'page': page,
-            'per_page': per_page,
-            'total': pagination.total,
-            'pages': pagination.pages
-        }
+        'pagination': pagination_info
     })
 
 @app.route('/api/species')
@@ -186,71 +507,84 @@ def api_species():
     } for s in species])
 
 @app.route('/api/statistics')
+@cache.cached(timeout=300, key_prefix=STATS_CACHE_KEY)
 def api_statistics():
     """API endpoint for data statistics"""
-    total_records = OccurrenceRecord.query.count()
-    records_with_coords = OccurrenceRecord.query.filter(
-        OccurrenceRecord.latitude.isnot(None),
-        OccurrenceRecord.longitude.isnot(None)
-    ).count()
+    has_coords = db.and_(OccurrenceRecord.latitude.isnot(None), OccurrenceRecord.longitude.isnot(None))
+    total_records, records_with_coords = db.session.query(
+        db.func.count(OccurrenceRecord.id),
+        db.func.coalesce(db.func.sum(db.case((has_coords, 1), else_=0)), 0)
+    ).one()
     
-    # Get unique values for filters
-    states = db.session.query(OccurrenceRecord.state).distinct().filter(
-        OccurrenceRecord.state.isnot(None)
-    ).all()
-    basins = db.session.query(OccurrenceRecord.river_basin).distinct().filter(
-        OccurrenceRecord.river_basin.isnot(None)
-    ).all()
-    species_list = db.session.query(OccurrenceRecord.species).distinct().filter(
-        OccurrenceRecord.species.isnot(None)
-    ).all()
+    # Get unique values for filters in a single UNION ALL round-trip
+    filter_columns = {
+        'states': OccurrenceRecord.state,
+        'basins': OccurrenceRecord.river_basin,
+        'species': OccurrenceRecord.species
+    }
+    distinct_values = db.union_all(*[
+        db.select(db.literal(name).label('field'), column.label('value')).where(column.isnot(None)).distinct()
+        for name, column in filter_columns.items()
+    ])
+    filter_values = {name: [] for name in filter_columns}
+    for field, value in db.session.execute(distinct_values):
+        if value:
+            filter_values[field].append(value)
     
     return jsonify({
         'total_records': total_records,
         'records_with_coordinates': records_with_coords,
         'coordinate_percentage': round((records_with_coords / total_records * 100), 1) if total_records > 0 else 0,
-        'states': [s[0] for s in states if s[0]],
-        'basins': [b[0] for b in basins if b[0]],
-        'species': [sp[0] for sp in species_list if sp[0]]
+        'states': filter_values['states'],
+        'basins': filter_values['basins'],
+        'species': filter_values['species']
     })
 
 @app.route('/api/map-data')
+@conditional_on_data
 def api_map_data():
-    """API endpoint for map visualization data"""
-    records = OccurrenceRecord.query.filter(
+    """API endpoint for map visualization data, optionally limited to ``bbox=minx,miny,maxx,maxy``"""
+    statement = db.select(*MAP_DATA_COLUMNS).where(
         OccurrenceRecord.latitude.isnot(None),
         OccurrenceRecord.longitude.isnot(None)
-    ).all()
+    )
+    
+    bbox = request.args.get('bbox')
+    if bbox:
+        try:
+            min_lng, min_lat, max_lng, max_lat = (float(value) for value in bbox.split(','))
+        except ValueError:
+            return jsonify({'error': 'bbox must be minx,miny,maxx,maxy'}), 400
+        # Range scan on the (latitude, longitude) index instead of reading every point
+        statement = statement.where(
+            OccurrenceRecord.latitude.between(min_lat, max_lat),
+            OccurrenceRecord.longitude.between(min_lng, max_lng)
+        )
     
-    features = []
-    for record in records:
-        if record.latitude and record.longitude:
-            feature = {
+    def generate():
+        # Emit the FeatureCollection one DataFrame chunk at a time
+        yield '{"type":"FeatureCollection","features":['
+        separator = ''
+        # stream_results makes psycopg2 use a server-side cursor; without it the whole
+        # result set is buffered client-side before the first chunk is returned
+        connection = db.session.connection().execution_options(
+            stream_results=True, max_row_buffer=STREAM_BATCH_SIZE
+        )
+        for chunk in pd.read_sql(statement, connection, chunksize=STREAM_BATCH_SIZE):
+            coordinates = zip(chunk['longitude'].tolist(), chunk['latitude'].tolist())
+            properties = chunk[list(MAP_PROPERTY_NAMES)].rename(columns=MAP_PROPERTY_NAMES).to_dict('records')
+            features = [{
                 'type': 'Feature',
-                'geometry': {
-                    'type': 'Point',
-                    'coordinates': [record.longitude, record.latitude]
-                },
-                'properties': {
-                    'id': record.id,
-                    'unique_record_id': record.unique_record_id,
-                    'species': record.species,
-                    'collection_date': record.collection_date.isoformat() if record.collection_date else None,
-                    'locality': record.locality_description,
-                    'state': record.state,
-                    'basin': record.river_basin,
-                    'collectors': record.collectors,
-                    'field_number': record.field_number,
-                    'institution': record.institution,
-                    'catalog_number': record.catalog_number
-                }
-            }
-            features.append(feature)
+                'geometry': {'type': 'Point', 'coordinates': [longitude, latitude]},
+                'properties': props
+            } for (longitude, latitude), props in zip(coordinates, properties)]
+            if features:
+                # Serialize the whole chunk at once and splice it into the array
+                yield separator + app.json.dumps(features)[1:-1]
+                separator = ','
+        yield ']}'
     
-    return jsonify({
-        'type': 'FeatureCollection',
-        'features': features
-    })
+    return Response(stream_with_context(generate()), mimetype='application/json')
 
 @app.route('/admin')
 def admin_panel():
@@ -269,76 +603,76 @@ def import_excel():
     
     try:
         # Read Excel file
-        df = pd.read_excel(file, sheet_name='Mex_trout_core')
+        df = pd.read_excel(file, sheet_name='Mex_trout_core', engine=EXCEL_ENGINE)
         
         # Process and import data
-        imported_count = 0
-        for _, row in df.iterrows():
-            # Create occurrence record
-            record = OccurrenceRecord(
-                unique_record_id=str(row.get('Final_database_unique_record_ID', '')),
-                collection_date=pd.to_datetime(row.get('data__yyyy', ''), errors='coerce').date() if pd.notna(row.get('data__yyyy')) else None,
-                latitude=row.get('lat_dec') if pd.notna(row.get('lat_dec')) else None,
-                longitude=row.get('long_dec') if pd.notna(row.get('long_dec')) else None,
-                locality_description=row.get('locality', ''),
-                state=row.get('state', ''),
-                municipality=row.get('municipio', ''),
-                river_basin=row.get('basin', ''),
-                sub_basin=row.get('subbasin', ''),
-                species=row.get('species', ''),
-                genus=row.get('genus', ''),
-                collectors=row.get('collectors', ''),
-                field_number=row.get('field_num', ''),
-                institution=row.get('institution', ''),
-                catalog_number=row.get('catalog_num', ''),
-                specimen_count=row.get('N_specimens') if pd.notna(row.get('N_specimens')) else None,
-                habitat_notes=row.get('habitat_notes', ''),
-                data_source='Excel Import'
-            )
-            
-            db.session.add(record)
-            imported_count += 1
-        
+        rows = build_occurrence_rows(df)
+        imported_count = insert_ignoring_duplicates(OccurrenceRecord, rows, 'unique_record_id')
+
         db.session.commit()
+        cache.delete_many(STATS_CACHE_KEY, DATA_VERSION_CACHE_KEY)
         return jsonify({'message': f'Successfully imported {imported_count} records'})
         
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': f'Import failed: {str(e)}'}), 500
 
+def write_export_csv(path):
+    """Write every occurrence record to path as CSV"""
+    columns = [getattr(OccurrenceRecord, attr).label(header) for header, attr in EXPORT_COLUMNS.items()]
+    
+    if db.engine.dialect.name == 'postgresql':
+        # Let the database render the CSV itself
+        sql = str(db.select(*columns).compile(dialect=db.engine.dialect))
+        connection = db.engine.raw_connection()
+        try:
+            with open(path, 'wb') as f:
+                connection.cursor().copy_expert(f'COPY ({sql}) TO STDOUT WITH CSV HEADER', f)
+        finally:
+            connection.close()
+        return
+    
+    query = db.session.query(*columns).execution_options(
+        stream_results=True
+    ).yield_per(STREAM_BATCH_SIZE)
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_COLUMNS)
+        writer.writerows(query)
+
 @app.route('/api/export-data')
 def export_data():
     """Export data as CSV"""
-    records = OccurrenceRecord.query.all()
-    
-    data = []
-    for record in records:
-        data.append({
-            'Unique Record ID': record.unique_record_id,
-            'Collection Date': record.collection_date.isoformat() if record.collection_date else '',
-            'Latitude': record.latitude,
-            'Longitude': record.longitude,
-            'Locality Description': record.locality_description,
-            'State': record.state,
-            'Municipality': record.municipality,
-            'River Basin': record.river_basin,
-            'Sub Basin': record.sub_basin,
-            'Species': record.species,
-            'Genus': record.genus,
-            'Collectors': record.collectors,
-            'Field Number': record.field_number,
-            'Institution': record.institution,
-            'Catalog Number': record.catalog_number,
-            'Specimen Count': record.specimen_count,
-            'Habitat Notes': record.habitat_notes,
-            'Conservation Status': record.conservation_status
-        })
+    # Unchanged data maps to the same file, so repeat exports are served from disk
+    last_modified, record_count = occurrence_data_version()
+    key = hashlib.sha1(f'{last_modified}|{record_count}'.encode()).hexdigest()[:16]
+    csv_path = os.path.join(EXPORT_CACHE_DIR, f'mexican_trout_export_{key}.csv')
     
-    df = pd.DataFrame(data)
-    csv_path = 'exported_data.csv'
-    df.to_csv(csv_path, index=False)
+    # Open the cached file rather than checking for it, so a concurrent request's
+    # stale-file sweep cannot delete it between the check and send_file
+    try:
+        export_file = open(csv_path, 'rb')
+    except FileNotFoundError:
+        # Build under a private name and rename so concurrent requests never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=EXPORT_CACHE_DIR, suffix='.csv.tmp')
+        os.close(fd)
+        try:
+            write_export_csv(tmp_path)
+            export_file = open(tmp_path, 'rb')
+            os.replace(tmp_path, csv_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        
+        # Exports of older data versions will never be requested again
+        for stale_path in glob.glob(os.path.join(EXPORT_CACHE_DIR, 'mexican_trout_export_*.csv')):
+            if stale_path != csv_path:
+                try:
+                    os.remove(stale_path)
+                except OSError:
+                    pass
     
-    return send_file(csv_path, as_attachment=True, download_name='mexican_trout_data.csv')
+    return send_file(export_file, mimetype='text/csv', as_attachment=True, download_name='mexican_trout_data.csv')
 
 if __name__ == '__main__':
     with app.app_context():
@@ -7,25 +7,29 @@ Loads Excel data into the database and populates initial species information
 import pandas as pd
 import sys
 import os
-from datetime import datetime
-from app import app, db, OccurrenceRecord, Species, GeneticData
+from app import (app, db, cache, OccurrenceRecord, Species, GeneticData,
+                 build_occurrence_rows, parse_collection_dates, insert_ignoring_duplicates,
+                 link_occurrences_to_species,
+                 STATS_CACHE_KEY, DATA_VERSION_CACHE_KEY, EXCEL_ENGINE)
 
 def load_excel_data(file_path):
     """Load data from Excel file"""
     print(f"Loading data from {file_path}...")
     
     try:
-        # Read the main data sheet
-        df = pd.read_excel(file_path, sheet_name='Mex_trout_core')
-        print(f"Loaded {len(df)} records from Mex_trout_core sheet")
-        
-        # Read species taxonomy sheet
-        species_df = pd.read_excel(file_path, sheet_name='taxa_names')
-        print(f"Loaded {len(species_df)} species from taxa_names sheet")
-        
-        # Read genetic data sheet
-        genetic_df = pd.read_excel(file_path, sheet_name='Abadia_S1')
-        print(f"Loaded {len(genetic_df)} genetic records from Abadia_S1 sheet")
+        # Open the workbook once and parse every sheet from the same handle
+        with pd.ExcelFile(file_path, engine=EXCEL_ENGINE) as xl:
+            # Read the main data sheet
+            df = xl.parse('Mex_trout_core')
+            print(f"Loaded {len(df)} records from Mex_trout_core sheet")
+            
+            # Read species taxonomy sheet
+            species_df = xl.parse('taxa_names')
+            print(f"Loaded {len(species_df)} species from taxa_names sheet")
+            
+            # Read genetic data sheet
+            genetic_df = xl.parse('Abadia_S1')
+            print(f"Loaded {len(genetic_df)} genetic records from Abadia_S1 sheet")
         
         return df, species_df, genetic_df
         
@@ -45,7 +49,7 @@ def clean_data(df):
     df['long_dec'] = pd.to_numeric(df['long_dec'], errors='coerce')
     
     # Clean date data
-    df['data__yyyy'] = pd.to_datetime(df['data__yyyy'], errors='coerce')
+    df['data__yyyy'] = parse_collection_dates(df['data__yyyy'])
     
     # Clean specimen count
     df['N_specimens'] = pd.to_numeric(df['N_specimens'], errors='coerce')
@@ -56,35 +60,31 @@ def clean_data(df):
     print(f"Cleaned data: {len(df)} records")
     return df
 
+# taxa_names spreadsheet columns copied onto Species
+SPECIES_COLUMNS = ['scientific_name', 'common_name', 'taxon_code',
+                   'conservation_status', 'iucn_assessment', 'description']
+
 def import_species_data(species_df):
     """Import species taxonomy data"""
     print("Importing species data...")
     
     imported_count = 0
-    for _, row in species_df.iterrows():
-        try:
-            # Check if species already exists
-            existing = Species.query.filter_by(scientific_name=row.get('scientific_name', '')).first()
-            if existing:
-                continue
-                
-            species = Species(
-                scientific_name=row.get('scientific_name', ''),
-                common_name=row.get('common_name', ''),
-                taxon_code=row.get('taxon_code', ''),
-                conservation_status=row.get('conservation_status', ''),
-                iucn_assessment=row.get('iucn_assessment', ''),
-                description=row.get('description', '')
-            )
-            
-            db.session.add(species)
-            imported_count += 1
-            
-        except Exception as e:
-            print(f"Error importing species {row.get('scientific_name', '')}: {e}")
-            continue
     
-    db.session.commit()
+    try:
+        records = species_df.reindex(columns=SPECIES_COLUMNS).dropna(subset=['scientific_name'])
+        records = records.astype(object).where(records.notna(), None)
+        
+        # Existing species are skipped by the database via the unique scientific_name
+        imported_count = insert_ignoring_duplicates(Species, records.to_dict('records'), 'scientific_name')
+        # Attach occurrence records that were imported before their species existed
+        linked_count = link_occurrences_to_species()
+        db.session.commit()
+        print(f"Linked {linked_count} occurrence records to species")
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error importing species: {e}")
+    
     print(f"Imported {imported_count} species")
     return imported_count
 
@@ -95,103 +95,58 @@ def import_occurrence_data(df):
     imported_count = 0
     errors = 0
     
-    for _, row in df.iterrows():
-        try:
-            # Check if record already exists
-            existing = OccurrenceRecord.query.filter_by(
-                unique_record_id=str(row.get('Final_database_unique_record_ID', ''))
-            ).first()
-            
-            if existing:
-                continue
-            
-            # Parse date
-            collection_date = None
-            if pd.notna(row.get('data__yyyy')):
-                if isinstance(row['data__yyyy'], str):
-                    try:
-                        collection_date = datetime.strptime(row['data__yyyy'], '%Y%m%d').date()
-                    except:
-                        try:
-                            collection_date = pd.to_datetime(row['data__yyyy']).date()
-                        except:
-                            collection_date = None
-                else:
-                    collection_date = row['data__yyyy'].date()
-            
-            record = OccurrenceRecord(
-                unique_record_id=str(row.get('Final_database_unique_record_ID', '')),
-                collection_date=collection_date,
-                latitude=row.get('lat_dec') if pd.notna(row.get('lat_dec')) else None,
-                longitude=row.get('long_dec') if pd.notna(row.get('long_dec')) else None,
-                locality_description=str(row.get('locality', '')),
-                state=str(row.get('state', '')),
-                municipality=str(row.get('municipio', '')),
-                river_basin=str(row.get('basin', '')),
-                sub_basin=str(row.get('subbasin', '')),
-                species=str(row.get('species', '')),
-                genus=str(row.get('genus', '')),
-                collectors=str(row.get('collectors', '')),
-                field_number=str(row.get('field_num', '')),
-                institution=str(row.get('institution', '')),
-                catalog_number=str(row.get('catalog_num', '')),
-                specimen_count=int(row.get('N_specimens')) if pd.notna(row.get('N_specimens')) else None,
-                habitat_notes=str(row.get('habitat_notes', '')),
-                conservation_status=str(row.get('conservation_status', '')),
-                data_source='Excel Import'
-            )
-            
-            db.session.add(record)
-            imported_count += 1
-            
-            # Commit every 100 records to avoid memory issues
-            if imported_count % 100 == 0:
-                db.session.commit()
-                print(f"Imported {imported_count} records...")
-                
-        except Exception as e:
-            errors += 1
-            print(f"Error importing record {row.get('Final_database_unique_record_ID', '')}: {e}")
-            continue
+    rows = build_occurrence_rows(df)
     
-    db.session.commit()
+    try:
+        # Single transaction: on SQLite every commit pays for an fsync
+        imported_count = insert_ignoring_duplicates(OccurrenceRecord, rows, 'unique_record_id')
+        db.session.commit()
+        
+    except Exception as e:
+        db.session.rollback()
+        errors = len(rows)
+        print(f"Error importing occurrence records: {e}")
+    
+    cache.delete_many(STATS_CACHE_KEY, DATA_VERSION_CACHE_KEY)
     print(f"Imported {imported_count} occurrence records with {errors} errors")
     return imported_count, errors
 
+# Abadia_S1 spreadsheet columns mapped to GeneticData attributes
+GENETIC_COLUMN_MAP = {
+    'Sample_Code': 'sample_code',
+    'Population_No': 'population_number',
+    'Genetic_Gr': 'genetic_group',
+    'Haplotype': 'haplotype',
+    'Sequence_Data': 'sequence_data'
+}
+
 def import_genetic_data(genetic_df):
     """Import genetic data from Abadia et al. (2015)"""
     print("Importing genetic data...")
     
     imported_count = 0
     
-    for _, row in genetic_df.iterrows():
-        try:
-            # Link to occurrence record if possible
-            occurrence_record_id = None
-            if pd.notna(row.get('Final_database_unique_record_ID')):
-                occurrence_record = OccurrenceRecord.query.filter_by(
-                    unique_record_id=str(row.get('Final_database_unique_record_ID'))
-                ).first()
-                if occurrence_record:
-                    occurrence_record_id = occurrence_record.id
-            
-            genetic_record = GeneticData(
-                occurrence_record_id=occurrence_record_id,
-                sample_code=str(row.get('Sample_Code', '')),
-                population_number=str(row.get('Population_No', '')),
-                genetic_group=str(row.get('Genetic_Gr', '')),
-                haplotype=str(row.get('Haplotype', '')),
-                sequence_data=str(row.get('Sequence_Data', ''))
-            )
-            
-            db.session.add(genetic_record)
-            imported_count += 1
-            
-        except Exception as e:
-            print(f"Error importing genetic record: {e}")
-            continue
+    try:
+        # Resolve all occurrence links with one query instead of one per row
+        record_ids = genetic_df['Final_database_unique_record_ID'].dropna().astype(str)
+        id_map = dict(db.session.query(OccurrenceRecord.unique_record_id, OccurrenceRecord.id).filter(
+            OccurrenceRecord.unique_record_id.in_(record_ids.unique().tolist())
+        ).all())
+        
+        records = genetic_df.reindex(columns=list(GENETIC_COLUMN_MAP)).rename(columns=GENETIC_COLUMN_MAP)
+        records = records.fillna('').astype(str)
+        records['occurrence_record_id'] = record_ids.map(id_map).astype('Int64')
+        records = records.astype(object).where(records.notna(), None)
+        
+        rows = records.to_dict('records')
+        db.session.bulk_insert_mappings(GeneticData, rows)
+        db.session.commit()
+        imported_count = len(rows)
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error importing genetic records: {e}")
     
-    db.session.commit()
     print(f"Imported {imported_count} genetic records")
     return imported_count
 
@@ -251,6 +206,7 @@ def create_sample_species():
         except Exception as e:
             print(f"Error creating species {species_data['scientific_name']}: {e}")
     
+    link_occurrences_to_species()
     db.session.commit()
     print(f"Created {imported_count} sample species")
     return imported_count
@@ -9,16 +9,130 @@ a modern web-based system to replace the discontinued Drupal platform.
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import folium
-from folium import plugins
+import argparse
 import os
 import json
+import shutil
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from openpyxl import load_workbook
+
+# The calamine reader is optional; without it sheets are streamed with openpyxl
+try:
+    import python_calamine  # noqa: F401
+    HAS_CALAMINE = True
+except ImportError:
+    HAS_CALAMINE = False
+
+# numba is optional; it only speeds up binning of very large maps
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Core-sheet columns the analyses read, with the dtypes they are parsed as; coordinates
+# and dates are read untyped and coerced to numbers after loading
+CORE_SHEET = 'Mex_trout_core'
+CORE_COLUMN_DTYPES = {
+    'State': 'category',
+    'Maj_Basin': 'category',
+    'cataloged genus': 'category',
+    'cataloged species': 'category',
+    'Collectors': 'category',
+    'Locality': 'string'
+}
+DATE_COLUMN = 'Date (yyyymmdd)'
+COORDINATE_COLUMNS = ['Lat_dec', 'Long_dec']
+CORE_COLUMNS = set(CORE_COLUMN_DTYPES) | set(COORDINATE_COLUMNS) | {DATE_COLUMN}
+
+# Parquet copy of the workbook kept next to the Excel file, and its manifest of sheet
+# order and core-sheet missing counts
+PARQUET_CACHE_SUFFIX = '.parquet.dir'
+PARQUET_CACHE_MANIFEST = 'manifest.json'
+
+# Bump when coerce_core_columns or trim_core_sheet change what gets cached; the manifest
+# records this with the core-sheet settings and a cache written under others is rebuilt
+PARQUET_CACHE_VERSION = 1
+PARQUET_CACHE_CONFIG = repr((
+    PARQUET_CACHE_VERSION, CORE_SHEET, CORE_COLUMN_DTYPES, sorted(CORE_COLUMNS),
+    COORDINATE_COLUMNS, DATE_COLUMN
+))
+
+# Resolution of the bar-chart PNGs, which are only viewed on screen
+CHART_DPI = 100
+
+# Number of genera listed in the report's taxonomy summary
+TOP_GENERA_COUNT = 10
+
+# Latitude and longitude bounds of the Mexican trout range shown on the map
+MAP_LAT_RANGE = (14, 33)
+MAP_LONG_RANGE = (-118, -96)
+
+# Above this many records the map counts records per grid cell of MAP_BIN_DEGREES
+# instead of grouping them by exact coordinates
+MAP_BINNING_THRESHOLD = 100_000
+MAP_BIN_DEGREES = 0.01
+MAP_BIN_COLUMNS = int((MAP_LONG_RANGE[1] - MAP_LONG_RANGE[0]) / MAP_BIN_DEGREES) + 1
+
+# Draws the map's circle markers from a [lat, lng, radius, popup, tooltip] array
+MAP_POINTS_TEMPLATE = """
+{% macro script(this, kwargs) %}
+    var points = {{ this.points }};
+    points.forEach(function (point) {
+        L.circleMarker([point[0], point[1]], {radius: point[2], fillOpacity: 0.7})
+            .bindPopup(point[3])
+            .bindTooltip(point[4])
+            .addTo({{ this._parent.get_name() }});
+    });
+{% endmacro %}
+"""
+
+def coordinate_bin_keys(lat, lng, bin_degrees):
+    """Number the map grid cell each coordinate pair falls in."""
+    rows = ((lat - MAP_LAT_RANGE[0]) // bin_degrees).astype(np.int64)
+    columns = ((lng - MAP_LONG_RANGE[0]) // bin_degrees).astype(np.int64)
+    return rows * MAP_BIN_COLUMNS + columns
+
+if HAS_NUMBA:
+    @njit(parallel=True, cache=True)
+    def coordinate_bin_keys_numba(lat, lng, bin_degrees):
+        """Parallel JIT-compiled equivalent of coordinate_bin_keys."""
+        keys = np.empty(lat.size, dtype=np.int64)
+        for i in prange(lat.size):
+            row = np.int64((lat[i] - MAP_LAT_RANGE[0]) // bin_degrees)
+            column = np.int64((lng[i] - MAP_LONG_RANGE[0]) // bin_degrees)
+            keys[i] = row * MAP_BIN_COLUMNS + column
+        return keys
+
+def dedupe_header(names):
+    """Name blank headers and suffix repeated ones the way read_excel does ("State", "State.1")."""
+    header = [f"Unnamed: {index}" if name is None else name for index, name in enumerate(names)]
+    counts = {}
+    for index, name in enumerate(header):
+        count = counts.get(name, 0)
+        base = name
+        while count > 0:
+            # Skip suffixes that are already taken by another header
+            counts[base] = count + 1
+            name = f"{base}.{count}"
+            count = count + 1 if name in header else counts.get(name, 0)
+        header[index] = name
+        counts[name] = count + 1
+    return header
+
+def join_unique(values):
+    """Join the distinct non-missing values of a group, in order of appearance."""
+    return ', '.join(values.dropna().astype(str).unique())
+
+def report_value(value):
+    """Convert the count Series inside a report section to plain dicts."""
+    if isinstance(value, pd.Series):
+        return dict(zip(value.index.to_list(), value.to_numpy().tolist()))
+    if isinstance(value, dict):
+        return {key: report_value(item) for key, item in value.items()}
+    return value
 
 class MexicanTroutAnalyzer:
     def __init__(self, excel_file_path):
@@ -26,20 +140,141 @@ class MexicanTroutAnalyzer:
         self.excel_file_path = excel_file_path
         self.data = {}
         self.analysis_results = {}
+        # Missing values per column of the whole core sheet, counted before it is trimmed
+        self.core_missing_counts = None
+        # Core-sheet subsets and counts shared by the analyses and the charts
+        self._geo_df = None
+        self._state_counts = None
+        self._basin_counts = None
         
     def load_data(self):
         """Load all sheets from the Excel file."""
         print("Loading Mexican Trout data...")
         
-        excel_file = pd.ExcelFile(self.excel_file_path)
-        print(f"Found {len(excel_file.sheet_names)} sheets: {excel_file.sheet_names}")
-        
-        for sheet_name in excel_file.sheet_names:
-            print(f"Loading sheet: {sheet_name}")
-            self.data[sheet_name] = pd.read_excel(self.excel_file_path, sheet_name=sheet_name)
+        # Reuse the Parquet copy of the workbook when it is still valid
+        cache_dir = os.path.splitext(self.excel_file_path)[0] + PARQUET_CACHE_SUFFIX
+        manifest_path = os.path.join(cache_dir, PARQUET_CACHE_MANIFEST)
+        manifest = self.read_cache_manifest(manifest_path)
+        if manifest is not None:
+            self.load_cached_sheets(cache_dir, manifest)
+        else:
+            if HAS_CALAMINE:
+                self.load_sheets_calamine()
+            else:
+                self.load_sheets_read_only()
+            self.coerce_core_columns()
+            self.cache_sheets(cache_dir, manifest_path)
             
         print("Data loading complete!")
         
+    def load_sheets_calamine(self):
+        """Parse every sheet concurrently with the calamine reader."""
+        # calamine releases the GIL while parsing and each worker opens its own workbook handle
+        with pd.ExcelFile(self.excel_file_path, engine='calamine') as excel_file:
+            sheet_names = excel_file.sheet_names
+        print(f"Found {len(sheet_names)} sheets: {sheet_names}")
+        
+        with ThreadPoolExecutor(max_workers=min(len(sheet_names), os.cpu_count() or 1)) as executor:
+            futures = {}
+            for sheet_name in sheet_names:
+                print(f"Loading sheet: {sheet_name}")
+                futures[sheet_name] = executor.submit(self.read_sheet, sheet_name)
+            self.data = {sheet_name: future.result() for sheet_name, future in futures.items()}
+            
+    def read_sheet(self, sheet_name):
+        """Parse one sheet of the Excel file with the calamine reader."""
+        if sheet_name == CORE_SHEET:
+            return self.trim_core_sheet(pd.read_excel(
+                self.excel_file_path,
+                sheet_name=sheet_name,
+                engine='calamine',
+                dtype=CORE_COLUMN_DTYPES
+            ))
+        return pd.read_excel(self.excel_file_path, sheet_name=sheet_name, engine='calamine')
+        
+    def load_sheets_read_only(self):
+        """Stream every sheet row by row with openpyxl's read-only reader."""
+        workbook = load_workbook(self.excel_file_path, read_only=True, data_only=True)
+        try:
+            print(f"Found {len(workbook.sheetnames)} sheets: {workbook.sheetnames}")
+            
+            for sheet_name in workbook.sheetnames:
+                print(f"Loading sheet: {sheet_name}")
+                rows = workbook[sheet_name].iter_rows(values_only=True)
+                header = dedupe_header(next(rows, ()))
+                rows = list(rows)
+                # Like read_excel, drop the empty rows at the end of the sheet but keep blank rows in between
+                while rows and all(value is None for value in rows[-1]):
+                    rows.pop()
+                df = pd.DataFrame(rows, columns=header).infer_objects()
+                if sheet_name == CORE_SHEET:
+                    # Keep the same dtypes as the calamine path
+                    df = self.trim_core_sheet(df.astype({
+                        column: dtype for column, dtype in CORE_COLUMN_DTYPES.items() if column in df.columns
+                    }))
+                self.data[sheet_name] = df
+        finally:
+            workbook.close()
+        
+    def trim_core_sheet(self, df):
+        """Count missing values in the whole core sheet, then keep only the analysed columns."""
+        self.core_missing_counts = df.isna().sum()
+        return df[[column for column in df.columns if column in CORE_COLUMNS]]
+        
+    def coerce_core_columns(self):
+        """Convert the core sheet's coordinates and yyyymmdd dates to numbers once."""
+        df = self.data.get(CORE_SHEET)
+        if df is None:
+            return
+        for column in COORDINATE_COLUMNS:
+            if column in df.columns:
+                df[column] = pd.to_numeric(df[column], errors='coerce')
+        if DATE_COLUMN in df.columns:
+            df[DATE_COLUMN] = np.trunc(pd.to_numeric(df[DATE_COLUMN], errors='coerce')).astype('Int64')
+            
+    def read_cache_manifest(self, manifest_path):
+        """Return the Parquet cache manifest, or None if it is stale or built with other settings."""
+        if (not os.path.exists(manifest_path)
+                or os.path.getmtime(manifest_path) <= os.path.getmtime(self.excel_file_path)):
+            return None
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+        except ValueError:
+            return None
+        return manifest if manifest.get('config') == PARQUET_CACHE_CONFIG else None
+        
+    def load_cached_sheets(self, cache_dir, manifest):
+        """Load every sheet from the Parquet cache directory."""
+        sheet_names = manifest['sheets']
+        if manifest['core_missing_counts'] is not None:
+            self.core_missing_counts = pd.Series(manifest['core_missing_counts'], dtype='int64')
+        print(f"Found {len(sheet_names)} cached sheets in {cache_dir}: {sheet_names}")
+        
+        for index, sheet_name in enumerate(sheet_names):
+            self.data[sheet_name] = pd.read_parquet(os.path.join(cache_dir, f"{index}.parquet"))
+            
+    def cache_sheets(self, cache_dir, manifest_path):
+        """Write every loaded sheet to the Parquet cache directory."""
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            for index, df in enumerate(self.data.values()):
+                df.to_parquet(os.path.join(cache_dir, f"{index}.parquet"), compression='zstd')
+            # The manifest is written last so a partial cache is never read back
+            missing_counts = self.core_missing_counts
+            with open(manifest_path, 'w') as f:
+                json.dump({
+                    'config': PARQUET_CACHE_CONFIG,
+                    'sheets': list(self.data),
+                    'core_missing_counts': None if missing_counts is None else {
+                        str(column): int(count) for column, count in missing_counts.items()
+                    }
+                }, f)
+            print(f"Cached sheets to {cache_dir}")
+        except Exception as e:
+            print(f"Could not cache sheets to Parquet: {e}")
+            shutil.rmtree(cache_dir, ignore_errors=True)
+        
     def analyze_core_data(self):
         """Analyze the core Mexican trout records."""
         print("\n=== CORE DATA ANALYSIS ===")
@@ -49,21 +284,21 @@ class MexicanTroutAnalyzer:
             return
             
         df = self.data['Mex_trout_core']
+        geo_mask = df[['Lat_dec', 'Long_dec']].notna().all(axis=1)
+        self._geo_df = df.loc[geo_mask]
         
-        # Basic statistics
+        # Basic statistics, with both distinct counts taken in one aggregation
+        unique_counts = df.agg({'State': 'nunique', 'Maj_Basin': 'nunique'})
         self.analysis_results['core_stats'] = {
             'total_records': len(df),
-            'records_with_coordinates': len(df[df['Lat_dec'].notna() & df['Long_dec'].notna()]),
-            'unique_states': df['State'].nunique(),
-            'unique_basins': df['Maj_Basin'].nunique(),
+            'records_with_coordinates': int(geo_mask.sum()),
+            'unique_states': int(unique_counts['State']),
+            'unique_basins': int(unique_counts['Maj_Basin']),
         }
         
-        # Handle date analysis carefully
-        date_col = 'Date (yyyymmdd)'
-        if date_col in df.columns:
-            # Convert to numeric where possible
-            numeric_dates = pd.to_numeric(df[date_col], errors='coerce')
-            valid_dates = numeric_dates.dropna()
+        # Dates were parsed to integers when the sheet was loaded
+        if DATE_COLUMN in df.columns:
+            valid_dates = df[DATE_COLUMN].dropna()
             if len(valid_dates) > 0:
                 self.analysis_results['core_stats']['date_range'] = {
                     'earliest': int(valid_dates.min()),
@@ -80,13 +315,14 @@ class MexicanTroutAnalyzer:
             date_range = self.analysis_results['core_stats']['date_range']
             print(f"Date range: {date_range['earliest']} to {date_range['latest']} ({date_range['valid_dates']} valid dates)")
         
-        # Geographic distribution
-        state_counts = df['State'].value_counts()
-        basin_counts = df['Maj_Basin'].value_counts()
+        # Geographic distribution (categorical columns count on their integer codes)
+        state_counts = self._state_counts = df['State'].value_counts()
+        basin_counts = self._basin_counts = df['Maj_Basin'].value_counts()
         
+        # Counts stay as Series until the report is written
         self.analysis_results['geographic_distribution'] = {
-            'states': state_counts.to_dict(),
-            'basins': basin_counts.to_dict()
+            'states': state_counts,
+            'basins': basin_counts
         }
         
         print("\nTop 5 States:")
@@ -106,16 +342,19 @@ class MexicanTroutAnalyzer:
         df = self.data['taxa_names']
         
         print("Species Classifications:")
-        for _, row in df.iterrows():
-            if pd.notna(row['Genus']) and pd.notna(row['species']):
-                species_name = f"{row['Genus']} {row['species']}"
-                if pd.notna(row['subspecies']):
-                    species_name += f" {row['subspecies']}"
-                print(f"  {row['TM_taxon_code']}: {species_name} - {row['common_name']}")
+        named = df.loc[df['Genus'].notna() & df['species'].notna()]
+        species_names = named['Genus'].astype(str) + ' ' + named['species'].astype(str)
+        species_names = species_names.where(
+            named['subspecies'].isna(), species_names + ' ' + named['subspecies'].astype(str)
+        )
+        lines = '  ' + named['TM_taxon_code'].astype(str) + ': ' + species_names + ' - ' + named['common_name'].astype(str)
+        if len(lines) > 0:
+            print('\n'.join(lines.tolist()))
                 
         self.analysis_results['taxonomy'] = {
             'total_taxa': len(df),
-            'species_list': df.to_dict('records')
+            'named_taxa': len(named),
+            'top_genera': df['Genus'].value_counts().head(TOP_GENERA_COUNT)
         }
         
     def create_geographic_visualizations(self):
@@ -126,10 +365,17 @@ class MexicanTroutAnalyzer:
             print("Core data not available for mapping!")
             return
             
-        df = self.data['Mex_trout_core']
-        
-        # Filter records with coordinates
-        geo_df = df[df['Lat_dec'].notna() & df['Long_dec'].notna()].copy()
+        # Plotting libraries are only imported when visualizations are requested
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        import folium
+        from jinja2 import Template
+        
+        # Reuse the records with coordinates found by the core analysis
+        if self._geo_df is None:
+            self.analyze_core_data()
+        geo_df = self._geo_df
         
         if len(geo_df) == 0:
             print("No geographic data available!")
@@ -143,25 +389,73 @@ class MexicanTroutAnalyzer:
         m = folium.Map(
             location=[geo_df['Lat_dec'].mean(), geo_df['Long_dec'].mean()],
             zoom_start=6,
-            tiles='OpenStreetMap'
+            tiles='OpenStreetMap',
+            prefer_canvas=True
         )
         
-        # Add markers for each record
-        for idx, row in geo_df.iterrows():
-            popup_text = f"""
-            <b>Location:</b> {row['Locality']}<br>
-            <b>State:</b> {row['State']}<br>
-            <b>Basin:</b> {row['Maj_Basin']}<br>
-            <b>Species:</b> {row['cataloged genus']} {row['cataloged species']}<br>
-            <b>Date:</b> {row['Date (yyyymmdd)']}<br>
-            <b>Collectors:</b> {row['Collectors']}
-            """
+        # Keep points inside the trout range
+        map_df = geo_df[
+            geo_df['Lat_dec'].between(*MAP_LAT_RANGE) & geo_df['Long_dec'].between(*MAP_LONG_RANGE)
+        ]
+        
+        # Draw one circle marker per location, sized by its record count, from a single
+        # JS array rendered after the map instead of one folium object per marker
+        if len(map_df) > MAP_BINNING_THRESHOLD:
+            # Too many records for per-location popups: count records per grid cell
+            bin_keys = coordinate_bin_keys_numba if HAS_NUMBA else coordinate_bin_keys
+            keys = bin_keys(
+                map_df['Lat_dec'].to_numpy(), map_df['Long_dec'].to_numpy(), MAP_BIN_DEGREES
+            )
+            cell_keys, counts = np.unique(keys, return_counts=True)
+            # Round the cell centres so float noise does not end up in the HTML
+            cell_lats = np.round(MAP_LAT_RANGE[0] + (cell_keys // MAP_BIN_COLUMNS + 0.5) * MAP_BIN_DEGREES, 6)
+            cell_lngs = np.round(MAP_LONG_RANGE[0] + (cell_keys % MAP_BIN_COLUMNS + 0.5) * MAP_BIN_DEGREES, 6)
+            labels = [f"{count} record" if count == 1 else f"{count} records" for count in counts.tolist()]
+            point_rows = list(zip(
+                cell_lats.tolist(), cell_lngs.tolist(), (np.sqrt(counts) * 2).tolist(),
+                [f"<b>Records:</b> {count}" for count in counts.tolist()], labels
+            ))
+        else:
+            # Merge records sharing a coordinate pair
+            points = map_df.assign(
+                species=map_df['cataloged genus'].astype(str) + ' ' + map_df['cataloged species'].astype(str)
+            ).groupby(['Lat_dec', 'Long_dec'], as_index=False, sort=False).agg(
+                n=('State', 'size'),
+                locality=('Locality', join_unique),
+                state=('State', join_unique),
+                basin=('Maj_Basin', join_unique),
+                species=('species', join_unique),
+                earliest=(DATE_COLUMN, 'min'),
+                latest=(DATE_COLUMN, 'max'),
+                collectors=('Collectors', join_unique)
+            )
+            radii = np.sqrt(points['n']) * 2
+            # join_unique over a categorical column can come back categorical, which won't concatenate
+            species_names = points['species'].astype(str)
+            earliest = points['earliest'].astype('string')
+            latest = points['latest'].astype('string')
+            dates = earliest.where((earliest == latest).fillna(True), earliest + ' to ' + latest).fillna('')
             
-            folium.Marker(
-                [row['Lat_dec'], row['Long_dec']],
-                popup=popup_text,
-                tooltip=f"{row['cataloged genus']} {row['cataloged species']}"
-            ).add_to(m)
+            # Build every popup's HTML in one vectorized pass
+            popups = (
+                '<b>Records:</b> ' + points['n'].astype(str)
+                + '<br><b>Location:</b> ' + points['locality'].astype(str)
+                + '<br><b>State:</b> ' + points['state'].astype(str)
+                + '<br><b>Basin:</b> ' + points['basin'].astype(str)
+                + '<br><b>Species:</b> ' + species_names
+                + '<br><b>Date:</b> ' + dates.astype(str)
+                + '<br><b>Collectors:</b> ' + points['collectors'].astype(str)
+            )
+            point_rows = list(zip(
+                points['Lat_dec'].tolist(), points['Long_dec'].tolist(), radii.tolist(),
+                popups.tolist(), species_names.tolist()
+            ))
+            
+        points_layer = folium.MacroElement()
+        points_layer._template = Template(MAP_POINTS_TEMPLATE)
+        points_layer.points = orjson.dumps(point_rows).decode().replace('</', '<\\/')
+        points_layer.add_to(m)
+        print(f"Mapped {len(map_df)} records at {len(point_rows)} locations")
             
         # Add layer control
         folium.LayerControl().add_to(m)
@@ -172,7 +466,7 @@ class MexicanTroutAnalyzer:
         
         # 2. Basin distribution chart
         print("Creating basin distribution chart...")
-        basin_counts = geo_df['Maj_Basin'].value_counts()
+        basin_counts = self._basin_counts
         
         fig, ax = plt.subplots(figsize=(12, 8))
         basin_counts.plot(kind='bar', ax=ax)
@@ -181,12 +475,12 @@ class MexicanTroutAnalyzer:
         ax.set_ylabel('Number of Records')
         ax.tick_params(axis='x', rotation=45)
         plt.tight_layout()
-        plt.savefig('visualizations/basin_distribution.png', dpi=300, bbox_inches='tight')
+        plt.savefig('visualizations/basin_distribution.png', dpi=CHART_DPI)
         plt.close()
         
         # 3. State distribution chart
         print("Creating state distribution chart...")
-        state_counts = geo_df['State'].value_counts()
+        state_counts = self._state_counts
         
         fig, ax = plt.subplots(figsize=(10, 6))
         state_counts.plot(kind='bar', ax=ax)
@@ -195,7 +489,7 @@ class MexicanTroutAnalyzer:
         ax.set_ylabel('Number of Records')
         ax.tick_params(axis='x', rotation=45)
         plt.tight_layout()
-        plt.savefig('visualizations/state_distribution.png', dpi=300, bbox_inches='tight')
+        plt.savefig('visualizations/state_distribution.png', dpi=CHART_DPI)
         plt.close()
         
     def analyze_data_quality(self):
@@ -208,15 +502,19 @@ class MexicanTroutAnalyzer:
             
         df = self.data['Mex_trout_core']
         
-        # Check for missing data
-        missing_data = {}
-        for column in df.columns:
-            missing_count = df[column].isna().sum()
-            missing_percent = (missing_count / len(df)) * 100
-            missing_data[column] = {
-                'missing_count': missing_count,
-                'missing_percent': missing_percent
+        # Check for missing data across every column of the sheet, counted at load
+        # time before unused columns were dropped
+        na_counts = self.core_missing_counts
+        if na_counts is None:
+            na_counts = df.isna().sum()
+        na_percents = na_counts.mul(100.0 / len(df))
+        missing_data = {
+            column: {
+                'missing_count': int(na_counts[column]),
+                'missing_percent': float(na_percents[column])
             }
+            for column in na_counts.index
+        }
             
         # Focus on key fields
         key_fields = ['Lat_dec', 'Long_dec', 'Date (yyyymmdd)', 'Collectors', 
@@ -355,49 +653,54 @@ class MexicanTroutAnalyzer:
         """Save the complete analysis report."""
         print("\n=== SAVING ANALYSIS REPORT ===")
         
-        report = {
-            'analysis_date': datetime.now().isoformat(),
-            'data_summary': self.analysis_results,
-            'file_info': {
-                'excel_file': self.excel_file_path,
-                'sheets_analyzed': list(self.data.keys())
-            }
+        # Write the JSON one analysis section at a time instead of building the whole report
+        options = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        file_info = {
+            'excel_file': self.excel_file_path,
+            'sheets_analyzed': list(self.data.keys())
         }
-        
-        # Save as JSON
-        with open('analysis_report.json', 'w') as f:
-            json.dump(report, f, indent=2, default=str)
+        with open('analysis_report.json', 'wb') as f:
+            f.write(b'{\n"analysis_date": ' + orjson.dumps(datetime.now().isoformat()))
+            f.write(b',\n"data_summary": {')
+            for index, (name, section) in enumerate(self.analysis_results.items()):
+                f.write(b',\n' if index else b'\n')
+                f.write(orjson.dumps(name) + b': ' + orjson.dumps(report_value(section), option=options))
+            f.write(b'\n},\n"file_info": ' + orjson.dumps(file_info, option=options) + b'\n}\n')
             
         # Save as markdown
         with open('analysis_report.md', 'w') as f:
-            f.write("# Mexican Trout Data Analysis Report\n\n")
-            f.write(f"**Analysis Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+            f.writelines(self.report_markdown_lines())
             
-            f.write("## Data Summary\n\n")
-            if 'core_stats' in self.analysis_results:
-                stats = self.analysis_results['core_stats']
-                f.write(f"- Total records: {stats['total_records']}\n")
-                f.write(f"- Records with coordinates: {stats['records_with_coordinates']}\n")
-                f.write(f"- States covered: {stats['unique_states']}\n")
-                f.write(f"- Major basins: {stats['unique_basins']}\n")
-                if 'date_range' in stats:
-                    date_range = stats['date_range']
-                    f.write(f"- Date range: {date_range['earliest']} to {date_range['latest']}\n")
-                f.write("\n")
-                
-            f.write("## Geographic Distribution\n\n")
-            if 'geographic_distribution' in self.analysis_results:
-                geo = self.analysis_results['geographic_distribution']
-                f.write("### Top States:\n")
-                for state, count in list(geo['states'].items())[:5]:
-                    f.write(f"- {state}: {count} records\n")
-                f.write("\n### Top Basins:\n")
-                for basin, count in list(geo['basins'].items())[:5]:
-                    f.write(f"- {basin}: {count} records\n")
-                    
         print("Analysis report saved to analysis_report.json and analysis_report.md")
         
-    def run_complete_analysis(self):
+    def report_markdown_lines(self):
+        """Yield the lines of the human-readable markdown report."""
+        yield "# Mexican Trout Data Analysis Report\n\n"
+        yield f"**Analysis Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        
+        yield "## Data Summary\n\n"
+        if 'core_stats' in self.analysis_results:
+            stats = self.analysis_results['core_stats']
+            yield f"- Total records: {stats['total_records']}\n"
+            yield f"- Records with coordinates: {stats['records_with_coordinates']}\n"
+            yield f"- States covered: {stats['unique_states']}\n"
+            yield f"- Major basins: {stats['unique_basins']}\n"
+            if 'date_range' in stats:
+                date_range = stats['date_range']
+                yield f"- Date range: {date_range['earliest']} to {date_range['latest']}\n"
+            yield "\n"
+            
+        yield "## Geographic Distribution\n\n"
+        if 'geographic_distribution' in self.analysis_results:
+            geo = self.analysis_results['geographic_distribution']
+            yield "### Top States:\n"
+            for state, count in geo['states'].head(5).items():
+                yield f"- {state}: {count} records\n"
+            yield "\n### Top Basins:\n"
+            for basin, count in geo['basins'].head(5).items():
+                yield f"- {basin}: {count} records\n"
+                
+    def run_complete_analysis(self, skip_viz=False):
         """Run the complete analysis pipeline."""
         print("=== MEXICAN TROUT BIODIVERSITY DATA ANALYSIS ===")
         print("Based on requirements from Dean Hendrickson, Cool Texas Fishes Biodiversity Lab\n")
@@ -411,7 +714,8 @@ class MexicanTroutAnalyzer:
         self.analyze_data_quality()
         
         # Create visualizations
-        self.create_geographic_visualizations()
+        if not skip_viz:
+            self.create_geographic_visualizations()
         
         # Generate recommendations
         self.generate_web_system_recommendations()
@@ -424,11 +728,16 @@ class MexicanTroutAnalyzer:
         print("Check the following files:")
         print("- analysis_report.json: Complete analysis data")
         print("- analysis_report.md: Human-readable report")
-        print("- visualizations/: Geographic visualizations")
+        if not skip_viz:
+            print("- visualizations/: Geographic visualizations")
         print("- project_plan.md: Implementation plan")
 
 def main():
     """Main function to run the analysis."""
+    parser = argparse.ArgumentParser(description="Analyze the Mexican trout workbook")
+    parser.add_argument('--skip-viz', action='store_true', help="skip the map and chart outputs")
+    args = parser.parse_args()
+    
     excel_file = "Mex_trout_records_merge_2011_12_ver11+Abadia_DAH2024-05-10 (version 1).xlsx"
     
     if not os.path.exists(excel_file):
@@ -436,7 +745,7 @@ def main():
         return
         
     analyzer = MexicanTroutAnalyzer(excel_file)
-    analyzer.run_complete_analysis()
+    analyzer.run_complete_analysis(skip_viz=args.skip_viz)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,61 @@
+"""Link occurrence records to species by foreign key and add occurrence indexes
+
+Revision ID: 3f1c2a9d7b10
+Revises:
+Create Date: 2026-10-15 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d7b10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# Indexes on occurrence_records declared by the model, by name
+OCCURRENCE_INDEXES = {
+    'ix_occ_coords': ['latitude', 'longitude'],
+    'ix_occurrence_records_latitude': ['latitude'],
+    'ix_occurrence_records_longitude': ['longitude'],
+    'ix_occurrence_records_state': ['state'],
+    'ix_occurrence_records_river_basin': ['river_basin'],
+    'ix_occurrence_records_species': ['species'],
+    'ix_occurrence_records_species_id': ['species_id'],
+}
+
+
+def upgrade():
+    # Databases created by db.create_all() after the model change already have the column
+    inspector = sa.inspect(op.get_bind())
+    columns = [column['name'] for column in inspector.get_columns('occurrence_records')]
+    if 'species_id' not in columns:
+        with op.batch_alter_table('occurrence_records') as batch_op:
+            batch_op.add_column(sa.Column('species_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key(
+                'fk_occurrence_records_species_id_species', 'species', ['species_id'], ['id']
+            )
+
+    # Likewise only create the filter and coordinate indexes that are missing
+    existing_indexes = {index['name'] for index in sa.inspect(op.get_bind()).get_indexes('occurrence_records')}
+    for name, index_columns in OCCURRENCE_INDEXES.items():
+        if name not in existing_indexes:
+            op.create_index(name, 'occurrence_records', index_columns)
+
+    # Backfill the link for records imported before it existed
+    op.execute(
+        "UPDATE occurrence_records "
+        "SET species_id = (SELECT id FROM species WHERE scientific_name = occurrence_records.species) "
+        "WHERE species_id IS NULL"
+    )
+
+
+def downgrade():
+    for name in OCCURRENCE_INDEXES:
+        op.drop_index(name, table_name='occurrence_records')
+    with op.batch_alter_table('occurrence_records') as batch_op:
+        batch_op.drop_constraint('fk_occurrence_records_species_id_species', type_='foreignkey')
+        batch_op.drop_column('species_id')
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Test script for the Mexican trout analysis
+Verifies that the numba map-binning kernel matches the numpy version
+"""
+
+import sys
+
+import numpy as np
+
+from mexican_trout_analysis_fixed import (HAS_NUMBA, MAP_BIN_DEGREES, MAP_LAT_RANGE, MAP_LONG_RANGE,
+                                          coordinate_bin_keys)
+
+def test_coordinate_bin_keys():
+    """Compare the numba and numpy grid-cell keys"""
+    print("Testing map coordinate binning...")
+
+    if not HAS_NUMBA:
+        print("⏭️  numba not installed, skipping")
+        return True
+
+    from mexican_trout_analysis_fixed import coordinate_bin_keys_numba
+
+    # Random points plus the range edges and points sitting exactly on cell borders
+    rng = np.random.default_rng(0)
+    lat = np.concatenate([
+        rng.uniform(*MAP_LAT_RANGE, 100_000),
+        [MAP_LAT_RANGE[0], MAP_LAT_RANGE[1], 20.0, 20.005, 20.01]
+    ])
+    lng = np.concatenate([
+        rng.uniform(*MAP_LONG_RANGE, 100_000),
+        [MAP_LONG_RANGE[0], MAP_LONG_RANGE[1], -100.0, -100.005, -100.01]
+    ])
+
+    expected = coordinate_bin_keys(lat, lng, MAP_BIN_DEGREES)
+    actual = coordinate_bin_keys_numba(lat, lng, MAP_BIN_DEGREES)
+    if np.array_equal(actual, expected):
+        print("✅ numba and numpy bin keys match")
+        return True
+
+    mismatches = np.flatnonzero(actual != expected)
+    print(f"❌ {len(mismatches)} bin keys differ, first at {lat[mismatches[0]]}, {lng[mismatches[0]]}")
+    return False
+
+if __name__ == "__main__":
+    success = test_coordinate_bin_keys()
+    sys.exit(0 if success else 1)
@@ -4,98 +4,167 @@ Test script for Mexican Trout Biodiversity Project
 Verifies that the Flask application works correctly
 """
 
-import requests
-import time
-import subprocess
 import sys
-import os
+
+from app import app, db, cache, OccurrenceRecord, STATS_CACHE_KEY, DATA_VERSION_CACHE_KEY
+
+# Seeded records sit far outside the study area so the checks only ever see them
+TEST_SPECIES = 'Testus seededi'
+TEST_RECORD_PREFIX = 'TEST-SEED-'
+TEST_COORDINATES = [(-60.0, -30.0), (-60.1, -30.1), (-10.0, -10.0)]
+TEST_BBOX = '-31,-61,-29,-59'
+
+def seed_test_records():
+    """Insert the test records, replacing any left behind by an earlier run"""
+    remove_test_records()
+    with app.app_context():
+        db.session.add_all([
+            OccurrenceRecord(unique_record_id=f'{TEST_RECORD_PREFIX}{index}', species=TEST_SPECIES,
+                             latitude=latitude, longitude=longitude)
+            for index, (latitude, longitude) in enumerate(TEST_COORDINATES)
+        ])
+        db.session.commit()
+    cache.delete_many(STATS_CACHE_KEY, DATA_VERSION_CACHE_KEY)
+
+def remove_test_records():
+    """Delete the seeded test records"""
+    with app.app_context():
+        OccurrenceRecord.query.filter(
+            OccurrenceRecord.unique_record_id.startswith(TEST_RECORD_PREFIX)
+        ).delete(synchronize_session=False)
+        db.session.commit()
+    cache.delete_many(STATS_CACHE_KEY, DATA_VERSION_CACHE_KEY)
 
 def test_app():
     """Test the Flask application"""
     print("Testing Mexican Trout Biodiversity Application...")
+    passed = True
     
-    # Start the app in background
     try:
-        # Start the Flask app
-        process = subprocess.Popen([sys.executable, 'app.py'], 
-                                 stdout=subprocess.PIPE, 
-                                 stderr=subprocess.PIPE)
-        
-        # Wait for app to start
-        print("Starting Flask application...")
-        time.sleep(5)
-        
-        # Test basic endpoints
-        base_url = "http://localhost:5000"
+        # Exercise the app in-process through Flask's test client
+        print("Starting Flask test client...")
+        with app.app_context():
+            db.create_all()
+        client = app.test_client()
         
         # Test home page
         print("Testing home page...")
-        response = requests.get(f"{base_url}/", timeout=10)
+        response = client.get("/")
         if response.status_code == 200:
             print("✅ Home page works")
         else:
             print(f"❌ Home page failed: {response.status_code}")
+            passed = False
         
         # Test API endpoints
         print("Testing API endpoints...")
         
         # Test statistics endpoint
-        response = requests.get(f"{base_url}/api/statistics", timeout=10)
+        response = client.get("/api/statistics")
         if response.status_code == 200:
-            data = response.json()
+            data = response.get_json()
             print(f"✅ Statistics API works - {data.get('total_records', 0)} records")
         else:
             print(f"❌ Statistics API failed: {response.status_code}")
+            passed = False
         
         # Test species endpoint
-        response = requests.get(f"{base_url}/api/species", timeout=10)
+        response = client.get("/api/species")
         if response.status_code == 200:
-            data = response.json()
+            data = response.get_json()
             print(f"✅ Species API works - {len(data)} species")
         else:
             print(f"❌ Species API failed: {response.status_code}")
+            passed = False
         
         # Test occurrences endpoint
-        response = requests.get(f"{base_url}/api/occurrences", timeout=10)
+        response = client.get("/api/occurrences")
         if response.status_code == 200:
-            data = response.json()
+            data = response.get_json()
             print(f"✅ Occurrences API works - {len(data.get('records', []))} records")
         else:
             print(f"❌ Occurrences API failed: {response.status_code}")
+            passed = False
         
         # Test map data endpoint
-        response = requests.get(f"{base_url}/api/map-data", timeout=10)
+        response = client.get("/api/map-data")
         if response.status_code == 200:
-            data = response.json()
+            data = response.get_json()
             print(f"✅ Map data API works - {len(data.get('features', []))} features")
         else:
             print(f"❌ Map data API failed: {response.status_code}")
+            passed = False
         
         # Test other pages
         pages = ['/species', '/map', '/data', '/admin']
         for page in pages:
-            response = requests.get(f"{base_url}{page}", timeout=10)
+            response = client.get(page)
             if response.status_code == 200:
                 print(f"✅ {page} page works")
             else:
                 print(f"❌ {page} page failed: {response.status_code}")
+                passed = False
+        
+        # Test filtering, paging and caching against seeded records
+        print("Testing seeded records...")
+        seed_test_records()
+        try:
+            # Test bbox filtering on map data
+            response = client.get(f"/api/map-data?bbox={TEST_BBOX}")
+            features = response.get_json().get('features', [])
+            species = {feature['properties']['species'] for feature in features}
+            if response.status_code == 200 and len(features) == 2 and species == {TEST_SPECIES}:
+                print("✅ Map data bbox filter works")
+            else:
+                print(f"❌ Map data bbox filter failed: {response.status_code}, {len(features)} features")
+                passed = False
+            
+            # Test malformed bbox
+            response = client.get("/api/map-data?bbox=1,2,3")
+            if response.status_code == 400:
+                print("✅ Malformed bbox rejected")
+            else:
+                print(f"❌ Malformed bbox not rejected: {response.status_code}")
+                passed = False
+            
+            # Test next_cursor chaining across pages
+            records = []
+            after_id = 0
+            while after_id is not None:
+                response = client.get("/api/occurrences",
+                                      query_string={'species': TEST_SPECIES, 'per_page': 2, 'after_id': after_id})
+                data = response.get_json()
+                records += data['records']
+                after_id = data['pagination']['next_cursor']
+            record_ids = [record['unique_record_id'] for record in records]
+            expected_ids = [f'{TEST_RECORD_PREFIX}{index}' for index in range(len(TEST_COORDINATES))]
+            if record_ids == expected_ids:
+                print("✅ Occurrences cursor paging works")
+            else:
+                print(f"❌ Occurrences cursor paging failed: {record_ids}")
+                passed = False
+            
+            # Test conditional request with the returned ETag
+            url = f"/api/occurrences?species={TEST_SPECIES}"
+            etag = client.get(url).headers.get('ETag')
+            response = client.get(url, headers={'If-None-Match': etag})
+            if etag and response.status_code == 304:
+                print("✅ Unchanged occurrences answered with 304")
+            else:
+                print(f"❌ Conditional request failed: {response.status_code}")
+                passed = False
+        finally:
+            remove_test_records()
         
-        print("\n🎉 All tests completed successfully!")
-        print("The Mexican Trout Biodiversity Application is working correctly.")
+        if passed:
+            print("\n🎉 All tests completed successfully!")
+            print("The Mexican Trout Biodiversity Application is working correctly.")
         
     except Exception as e:
         print(f"❌ Test failed: {e}")
         return False
     
-    finally:
-        # Clean up
-        try:
-            process.terminate()
-            process.wait(timeout=5)
-        except:
-            process.kill()
-    
-    return True
+    return passed
 
 if __name__ == "__main__":
     success = test_app()